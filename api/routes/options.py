@@ -60,13 +60,9 @@ def get_stock_price():
     tickers = [t.strip() for t in tickers_param.split(',')]
     
     # Get stock prices for the tickers
-    prices = {}
     try:
-        for ticker in tickers:
-            if ticker:
-                # Use the options service to get the stock price without option data
-                price = options_service.get_stock_price(ticker)
-                prices[ticker] = price
+        # Use the options service to get all stock prices in one batch without option data
+        prices = options_service.get_stock_prices([t for t in tickers if t])
         
         return jsonify({
             "status": "success",
@@ -5,21 +5,20 @@ Handles options data retrieval and processing
 
 import logging
 import math
-import random
 import time
-from datetime import datetime, timedelta, time as datetime_time
-import pandas as pd
-from core.connection import IBConnection, Option, Stock, suppress_ib_logs
-from core.utils import get_closest_friday, get_next_monthly_expiration, is_market_hours
+from datetime import datetime
+from core.connection import IBConnection
+from core.utils import get_closest_friday, is_market_hours
 from config import Config
 from db.database import OptionsDatabase
 import traceback
-import concurrent.futures
-from functools import partial
-import json
 
 logger = logging.getLogger('api.services.options')
 
+def _nan_to_zero(value):
+    """Return 0 for NaN, otherwise the value unchanged"""
+    return 0 if isinstance(value, float) and math.isnan(value) else value
+
 class OptionsService:
     """
     Service for handling options data operations
@@ -50,28 +49,27 @@ class OptionsService:
                     return self.connection
                 else:
                     logger.warning("Failed to reconnect with existing client ID, will create new connection")
+                    self.connection.disconnect()
         
-            # No connection or reconnection failed, create a new one
-            # Generate a unique client ID based on current timestamp and random number
-            unique_client_id = int(time.time() % 10000) + random.randint(1000, 9999)
-            logger.info(f"Creating new TWS connection with client ID: {unique_client_id}")
+            # No connection or reconnection failed, create a new one; acquire
+            # allocates a client ID of its own for this service
+            logger.info("Creating new TWS connection")
             
             port = self.config.get('port', 7497)
             
-            self.connection = IBConnection(
+            self.connection = IBConnection.acquire(
                 host=self.config.get('host', '127.0.0.1'),
                 port=port,
-                client_id=unique_client_id,  # Use the unique client ID instead of fixed ID 1
                 timeout=self.config.get('timeout', 20),
                 readonly=self.config.get('readonly', True)
             )
             
-            # Try to connect with proper error handling
-            if not self.connection.connect():
+            # acquire returns None when the connection could not be established
+            if self.connection is None:
                 logger.error("Failed to connect to TWS/IB Gateway")
                 return None
             else:
-                logger.info("Successfully connected to TWS/IB Gateway")
+                logger.info(f"Successfully connected to TWS/IB Gateway with client ID: {self.connection.client_id}")
                 return self.connection
         except Exception as e:
             logger.error(f"Error ensuring connection: {str(e)}")
@@ -122,10 +120,7 @@ class OptionsService:
                     "error": f"Cannot execute order with status '{order['status']}'. Only 'pending' orders can be executed."
                 }, 400
                 
-            # Get connection to TWS
-            suppress_ib_logs()
-            
-            # Use the existing connection method
+            # Get connection to TWS using the existing connection method
             conn = self._ensure_connection()
             if not conn:
                 logger.error("Failed to connect to TWS")
@@ -275,7 +270,7 @@ class OptionsService:
                 order_type=order_type,
                 limit_price=limit_price
             )
-            logger.debug(f"Created IB order: {ib_order}")
+            logger.debug("Created IB order: %s", ib_order)
             if not ib_order:
                 conn.disconnect()
                 return {
@@ -562,29 +557,12 @@ class OptionsService:
                             last = (bid + ask) / 2 if bid > 0 or ask > 0 else 0.1
                         
                         # Handle NaN values for Greeks
-                        iv = option.get('implied_volatility', 0)
-                        if isinstance(iv, float) and math.isnan(iv):
-                            iv = 0
-                        
-                        delta = option.get('delta', 0)
-                        if isinstance(delta, float) and math.isnan(delta):
-                            delta = 0
-                        
-                        gamma = option.get('gamma', 0)
-                        if isinstance(gamma, float) and math.isnan(gamma):
-                            gamma = 0
-                        
-                        theta = option.get('theta', 0)
-                        if isinstance(theta, float) and math.isnan(theta):
-                            theta = 0
-                        
-                        vega = option.get('vega', 0)
-                        if isinstance(vega, float) and math.isnan(vega):
-                            vega = 0
-                        
-                        open_interest = option.get('open_interest', 0)
-                        if isinstance(open_interest, float) and math.isnan(open_interest):
-                            open_interest = 0
+                        iv = _nan_to_zero(option.get('implied_volatility', 0))
+                        delta = _nan_to_zero(option.get('delta', 0))
+                        gamma = _nan_to_zero(option.get('gamma', 0))
+                        theta = _nan_to_zero(option.get('theta', 0))
+                        vega = _nan_to_zero(option.get('vega', 0))
+                        open_interest = _nan_to_zero(option.get('open_interest', 0))
                         
                         # Format option data with flattened structure
                         option_data = {
@@ -712,10 +690,12 @@ class OptionsService:
                     limit=50  # Limit to most recent orders
                 )
                 
-                # Log details of each order at debug level
-                for i, order in enumerate(orders):
-                    logger.debug(f"Order {i+1}: ID={order.get('id')}, Status={order.get('status')}, " +
-                                f"Executed={order.get('executed')}, IB ID={order.get('ib_order_id', 'None')}")
+                # Log details of each order at debug level, skipping the loop entirely when disabled
+                if logger.isEnabledFor(logging.DEBUG):
+                    for i, order in enumerate(orders):
+                        logger.debug("Order %d: ID=%s, Status=%s, Executed=%s, IB ID=%s",
+                                     i + 1, order.get('id'), order.get('status'),
+                                     order.get('executed'), order.get('ib_order_id', 'None'))
                     
             except Exception as db_error:
                 logger.error(f"Error retrieving orders from database: {str(db_error)}")
@@ -852,7 +832,6 @@ class OptionsService:
             # If the order is processing in IBKR, we need to cancel it there first
             if order['status'] == 'processing' and order.get('ib_order_id'):
                 # Connect to TWS
-                suppress_ib_logs()
                 conn = None
                 tws_cancel_success = False
                 tws_error_message = None
@@ -1027,27 +1006,38 @@ class OptionsService:
         Returns:
             float: Current stock price
         """
+        return self.get_stock_prices([ticker])[ticker]
+
+    def get_stock_prices(self, tickers):
+        """
+        Get the current stock prices for several tickers in one batch.
+        
+        Args:
+            tickers (list): Ticker symbols
+            
+        Returns:
+            dict: Ticker to current stock price, with 0 for tickers without a valid price
+        """
+        # Nothing to look up, so don't connect to TWS
+        if not tickers:
+            return {}
+        
         try:
             # Use _ensure_connection to get or create a connection
             conn = self._ensure_connection()
             if not conn:
                 logger.error("Failed to establish connection to IB")
-                return 0
+                return dict.fromkeys(tickers, 0)
             
-            # Use the existing get_stock_price method from the connection
-            stock_price = conn.get_stock_price(ticker)
+            # Qualify and request all tickers together instead of one by one
+            prices = conn.get_multiple_stock_prices(tickers)
             
-            # Check if we got a valid price
-            if stock_price is None or stock_price <= 0:
-                logger.warning(f"Got invalid stock price for {ticker}: {stock_price}")
-                return 0
-            
-            return stock_price
+            return {ticker: price if price is not None and price > 0 else 0 for ticker, price in prices.items()}
         
         except Exception as e:
-            logger.error(f"Error getting stock price for {ticker}: {str(e)}")
+            logger.error(f"Error getting stock prices for {', '.join(tickers)}: {str(e)}")
             logger.error(traceback.format_exc())
-            return 0 
+            return dict.fromkeys(tickers, 0)
 
     def get_option_expirations(self, ticker):
         """
@@ -1077,12 +1067,8 @@ class OptionsService:
             else:
                 conn.set_market_data_type(1)  # Live data when market is open
                 
-            # Create a Stock object for the ticker
-            stock = Stock(ticker, 'SMART', 'USD')
-            conn.ib.qualifyContracts(stock)
-            
             # Get option chains to find available expirations
-            chains = conn.ib.reqSecDefOptParams(stock.symbol, '', stock.secType, stock.conId)
+            chains = conn.get_option_chains(ticker)
             
             if not chains:
                 logger.error(f"No option chains found for {ticker}")
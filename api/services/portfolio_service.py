@@ -4,8 +4,6 @@ Manages portfolio data and calculations
 """
 
 import logging
-import random
-import time
 from core.connection import IBConnection
 from config import Config
 import traceback
@@ -27,25 +25,24 @@ class PortfolioService:
         """
         try:
             if self.connection is None or not self.connection.is_connected():
-                # Generate a unique client ID based on current timestamp and random number
-                # to avoid conflicts with other connections
-                unique_client_id = int(time.time() % 10000) + random.randint(1000, 9999)
-                logger.info(f"Creating new TWS connection with client ID: {unique_client_id}")
+                # Give the dropped connection's pooled client back before replacing it
+                if self.connection is not None:
+                    self.connection.disconnect()
                 
-                # Create new connection
+                # Create a new connection; acquire allocates a client ID of its
+                # own for this service
                 port = self.config.get('port', 7497)
                 logger.info(f"Connecting to TWS on port: {port}")
                 
-                self.connection = IBConnection(
+                self.connection = IBConnection.acquire(
                     host=self.config.get('host', '127.0.0.1'),
                     port=port,
-                    client_id=unique_client_id,  # Use the unique client ID instead of fixed ID 1
                     timeout=self.config.get('timeout', 20),
                     readonly=self.config.get('readonly', True)
                 )
                 
-                # Try to connect with proper error handling
-                if not self.connection.connect():
+                # acquire returns None when the connection could not be established
+                if self.connection is None:
                     logger.error("Failed to connect to TWS/IB Gateway")
                 else:
                     logger.info("Successfully connected to TWS/IB Gateway")
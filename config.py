@@ -1,6 +1,16 @@
 import os
+import copy
 import json
+import stat
 import logging
+import tempfile
+from types import MappingProxyType
+
+# orjson parses noticeably faster than the standard library when installed
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
 
 logger = logging.getLogger('autotrader.config')
 
@@ -9,6 +19,14 @@ class Config:
     Configuration class for the AutoTrader application
     """
     
+    # Instances only ever hold the configuration dict
+    __slots__ = ('config',)
+    
+    # Parsed configuration files keyed by absolute path, stored together with
+    # the file's modification time, size and inode so that edits on disk
+    # invalidate the entry even when they land within one timestamp tick
+    _file_cache = {}
+    
     def __init__(self, default_config=None, config_file=None):
         """
         Initialize the configuration with default values and load from a file if provided
@@ -21,17 +39,16 @@ class Config:
         self.config = default_config.copy() if default_config else {}
         
         # If config_file is not provided, check environment variable
-        if config_file is None:
-            env_config_file = os.environ.get('CONNECTION_CONFIG', 'connection.json')
-            if os.path.exists(env_config_file):
-                config_file = env_config_file
-                logger.info(f"Using connection config from environment: {env_config_file}")
+        from_env = config_file is None
+        if from_env:
+            config_file = os.environ.get('CONNECTION_CONFIG', 'connection.json')
         
-        # Load from file if provided
-        if config_file and os.path.exists(config_file):
-            self.load_from_file(config_file)
+        # Load from file if provided; a missing file is simply skipped
+        if config_file and self.load_from_file(config_file):
+            if from_env:
+                logger.info(f"Using connection config from environment: {config_file}")
             logger.info(f"Configuration loaded from: {config_file}")
-            logger.debug(f"Connection port: {self.get('port')}")
+            logger.debug("Connection port: %s", self.get('port'))
             
     def load_from_file(self, config_file):
         """
@@ -44,16 +61,35 @@ class Config:
             bool: True if successful, False otherwise
         """
         try:
-            with open(config_file, 'r') as f:
-                file_config = json.load(f)
+            path = os.path.abspath(config_file)
+            st = os.stat(path)
+            signature = (st.st_mtime_ns, st.st_size, st.st_ino)
+            
+            cached = Config._file_cache.get(path)
+            if cached is not None and cached[0] == signature:
+                file_config = cached[1]
+            else:
+                with open(path, 'rb') as f:
+                    file_config = _json_loads(f.read())
+                Config._file_cache[path] = (signature, file_config)
                 
-            # Update our configuration with values from the file
-            self.config.update(file_config)
+            # Update our configuration with a copy so that later changes to
+            # this instance don't leak into the cached values
+            self.config.update(copy.deepcopy(file_config))
             return True
+        except FileNotFoundError:
+            return False
         except Exception as e:
             logger.error(f"Error loading configuration from {config_file}: {str(e)}")
             return False
             
+    @classmethod
+    def clear_cache(cls):
+        """
+        Clear the cache of parsed configuration files
+        """
+        cls._file_cache.clear()
+            
     def get(self, key, default=None):
         """
         Get a configuration value
@@ -77,29 +113,68 @@ class Config:
         """
         self.config[key] = value
         
-    def to_dict(self):
+    def to_dict(self, *, view=False):
         """
         Get the entire configuration as a dictionary
         
+        Read-only callers can pass view=True to skip the copy and get a
+        read-only view, which reflects later changes to the configuration.
+        
+        Args:
+            view (bool, optional): Return a read-only view instead of a copy. Defaults to False.
+            
         Returns:
-            dict: Configuration dictionary
+            dict: Configuration dictionary, or a read-only view of it
         """
-        return self.config.copy()
+        return MappingProxyType(self.config) if view else self.config.copy()
         
-    def save_to_file(self, config_file):
+    def save_to_file(self, config_file, durable=True):
         """
         Save the configuration to a JSON file
         
+        The file is written to a temporary path next to the target and then
+        renamed over it, so a crash never leaves a truncated configuration.
+        
         Args:
             config_file (str): Path to a JSON configuration file
+            durable (bool, optional): Whether to fsync the data before the rename. Defaults to True.
             
         Returns:
             bool: True if successful, False otherwise
         """
+        tmp_file = None
         try:
-            with open(config_file, 'w') as f:
-                json.dump(self.config, f, indent=4)
+            payload = json.dumps(self.config, indent=4).encode('utf-8')
+            
+            # Keep the permissions of the file being replaced; it may hold account details
+            try:
+                mode = stat.S_IMODE(os.stat(config_file).st_mode)
+            except FileNotFoundError:
+                mode = 0o644
+            
+            # A unique temporary name keeps concurrent saves from clobbering each other
+            directory, name = os.path.split(os.path.abspath(config_file))
+            fd, tmp_file = tempfile.mkstemp(prefix=f"{name}.", suffix='.tmp', dir=directory)
+            try:
+                os.chmod(tmp_file, mode)
+                view = memoryview(payload)
+                while view:
+                    view = view[os.write(fd, view):]
+                if durable:
+                    os.fsync(fd)
+            finally:
+                os.close(fd)
+                
+            os.replace(tmp_file, config_file)
+            
+            # Don't let a cached parse of the old contents outlive the save
+            Config._file_cache.pop(os.path.abspath(config_file), None)
             return True
         except Exception as e:
             logger.error(f"Error saving configuration to {config_file}: {str(e)}")
+            if tmp_file is not None:
+                try:
+                    os.remove(tmp_file)
+                except OSError:
+                    pass
             return False 
\ No newline at end of file
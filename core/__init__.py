@@ -1,27 +1,34 @@
 """
 AutoTrader Core Module
+
+Public names are resolved lazily on first access so that importing a light
+submodule (e.g. core.utils) doesn't pull in ib_async through core.connection.
 """
 
-# Import tools and utilities
-from .utils import (
-    setup_logging, 
-    rotate_logs, 
-    rotate_reports, 
-    get_closest_friday, 
-    get_next_monthly_expiration,
-    format_currency,
-    format_percentage,
-    get_strikes_around_price
-)
-
-# Import connection classes
-from .connection import IBConnection, Option
+import importlib
+
+# Map of exported names to the submodule that defines them
+_LAZY_EXPORTS = {
+    # Connection
+    'IBConnection': '.connection',
+    'Option': '.connection',
+
+    # Utils
+    'setup_logging': '.utils',
+    'rotate_logs': '.utils',
+    'rotate_reports': '.utils',
+    'get_closest_friday': '.utils',
+    'get_next_monthly_expiration': '.utils',
+    'format_currency': '.utils',
+    'format_percentage': '.utils',
+    'get_strikes_around_price': '.utils'
+}
 
 __all__ = [
     # Connection
     'IBConnection',
     'Option',
-    
+
     # Utils
     'rotate_logs',
     'rotate_reports',
@@ -31,4 +38,21 @@ __all__ = [
     'format_currency',
     'format_percentage',
     'get_strikes_around_price'
-] 
\ No newline at end of file
+]
+
+def __getattr__(name):
+    """
+    Import the submodule that provides an exported name on first access
+    """
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+
+    # Cache on the package so later lookups bypass __getattr__
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -4,12 +4,16 @@ Stock and Options Trading Connection Module for Interactive Brokers
 
 import logging
 import asyncio
+import contextlib
+import itertools
 import math
+import random
 import time
 import os
 import json
 import threading
 import traceback
+from collections import OrderedDict
 from typing import Optional, Dict, Any
 from datetime import datetime
 import pytz
@@ -17,7 +21,7 @@ from core.utils import is_market_hours
 from .currency import CurrencyHelper
 
 # Import ib_async instead of ib_insync
-from ib_async import IB, Stock, Option, Contract, util
+from ib_async import IB, Stock, Option, Ticker, util
 
 # Import our logging configuration
 from core.logging_config import get_logger
@@ -25,11 +29,22 @@ from core.logging_config import get_logger
 # Configure logging
 logger = get_logger('autotrader.connection', 'tws')
 
+# Whether suppress_ib_logs has already raised the ib_async log levels
+_IB_LOGS_SUPPRESSED = False
+
 # Set ib_async logger to WARNING level to reduce noise
 def suppress_ib_logs():
     """
     Suppress verbose logs from the ib_async library by setting higher log levels
+    
+    The levels only need to be set once per process, so later calls return
+    immediately.
     """
+    global _IB_LOGS_SUPPRESSED
+    if _IB_LOGS_SUPPRESSED:
+        return
+    _IB_LOGS_SUPPRESSED = True
+    
     # Base ib_async loggers
     logging.getLogger('ib_async').setLevel(logging.WARNING)
     logging.getLogger('ib_async.wrapper').setLevel(logging.WARNING)
@@ -51,11 +66,148 @@ def suppress_ib_logs():
 # Call to suppress IB logs
 suppress_ib_logs()
 
+# Maximum number of qualified contracts kept per connection
+CONTRACT_CACHE_SIZE = 4096
+
+# Seconds an option chain definition is reused before it is requested again
+OPTION_CHAIN_CACHE_TTL = 3600
+
+# Default number of seconds a stock price is reused before it is requested again
+PRICE_CACHE_TTL = 0.5
+
+# Optional Ticker fields, resolved once instead of with hasattr on every tick
+_TICKER_HAS_LAST_RTH_TRADE = hasattr(Ticker, 'lastRTHTrade')
+
+# Generic ticks requested for options: option open interest (101) and option
+# implied volatility (106). The contract's own volume arrives with the default
+# ticks, so option volume (100) is not requested.
+OPTION_GENERIC_TICKS = '101,106'
+
+def _positive_or_zero(value):
+    """Return the value if it is a positive number, otherwise 0"""
+    return value if value is not None and value > 0 else 0
+
+def _contract_key(contract):
+    """Build a hashable key identifying a contract before qualification"""
+    return (contract.symbol, contract.secType, contract.exchange, contract.currency,
+            contract.lastTradeDateOrContractMonth, contract.strike, contract.right)
+
+def _valid_price(value):
+    """Check whether a ticker field holds a usable price; IB reports missing values as NaN"""
+    return value is not None and math.isfinite(value) and value > 0
+
+def _select_price(ticker):
+    """
+    Pick the best available price from a stock ticker
+    
+    Prefers the last or close price, then falls back to the bid/ask midpoint,
+    the bid, the ask and finally the last regular-trading-hours trade.
+    
+    Returns:
+        float: The price or None if the ticker has no usable price
+    """
+    last_price = ticker.last
+    if _valid_price(last_price):
+        return last_price
+    close_price = ticker.close
+    if _valid_price(close_price):
+        return close_price
+    
+    # If no last price is available, check other prices
+    bid_price = ticker.bid
+    ask_price = ticker.ask
+    has_bid = _valid_price(bid_price)
+    has_ask = _valid_price(ask_price)
+    if has_bid and has_ask:
+        # Use midpoint of bid-ask spread
+        return (bid_price + ask_price) / 2
+    if has_bid:
+        return bid_price
+    if has_ask:
+        return ask_price
+    if _TICKER_HAS_LAST_RTH_TRADE and ticker.lastRTHTrade and _valid_price(ticker.lastRTHTrade.price):
+        return ticker.lastRTHTrade.price
+    return None
+
+def _has_market_price(ticker):
+    """Check whether a ticker has received a usable market price"""
+    price = ticker.marketPrice()
+    return price is not None and price > 0
+
+def _has_model_greeks(ticker):
+    """Check whether an option ticker has received its model greeks and implied volatility"""
+    return ticker.modelGreeks is not None and ticker.impliedVolatility is not None and ticker.impliedVolatility > 0
+
+
+class IBConnectionPool:
+    """
+    Process-wide pool of IB clients shared between IBConnection instances
+    
+    Clients are keyed by (host, port, client_id, readonly) and reference
+    counted, so connections with the same settings share one IB client and
+    socket instead of each setting one up and competing for the client ID.
+    A connection never gets a session opened with a different readonly mode.
+    """
+    # (host, port, client_id, readonly) -> [IB client, number of holders]
+    _pool = {}
+    _lock = threading.Lock()
+    
+    @classmethod
+    def acquire(cls, host, port, client_id, readonly):
+        """
+        Get the shared IB client for a connection, creating it if needed
+        
+        Args:
+            host (str): TWS/IB Gateway host
+            port (int): TWS/IB Gateway port
+            client_id (int): Client ID for TWS/IB Gateway
+            readonly (bool): Whether the session is readonly
+            
+        Returns:
+            IB: The shared IB client
+        """
+        key = (host, port, client_id, readonly)
+        with cls._lock:
+            entry = cls._pool.get(key)
+            if entry is None:
+                entry = cls._pool[key] = [IB(), 0]
+            entry[1] += 1
+            return entry[0]
+    
+    @classmethod
+    def release(cls, host, port, client_id, readonly):
+        """
+        Give up one hold on a shared IB client
+        
+        Args:
+            host (str): TWS/IB Gateway host
+            port (int): TWS/IB Gateway port
+            client_id (int): Client ID for TWS/IB Gateway
+            readonly (bool): Whether the session is readonly
+            
+        Returns:
+            bool: True if the caller was the last holder and the client was
+                  removed from the pool, False otherwise
+        """
+        key = (host, port, client_id, readonly)
+        with cls._lock:
+            entry = cls._pool.get(key)
+            if entry is None:
+                return False
+            entry[1] -= 1
+            if entry[1] > 0:
+                return False
+            del cls._pool[key]
+            return True
 
 class IBConnection:
     """
     Class for managing connection to Interactive Brokers
     """
+    # Client IDs for acquire calls that don't ask for one. The random start
+    # keeps separate processes from handing out the same IDs.
+    _client_ids = itertools.count(random.randint(1000, 9999))
+    
     def __init__(self, host='127.0.0.1', port=7497, client_id=1, timeout=20, readonly=True):
         """
         Initialize the IB connection
@@ -72,11 +224,59 @@ class IBConnection:
         self.client_id = client_id
         self.timeout = timeout
         self.readonly = readonly
-        self.ib = IB()
+        
+        # The pooled IB client is only taken while connected; see connect()
+        self.ib = None
+        self._pooled = False
         self._connected = False
         
-        # Suppress ib_async logs when initializing
-        suppress_ib_logs()
+        # Qualified contracts in least-recently-used order
+        self._contract_cache = OrderedDict()
+        
+        # (symbol, exchange) -> (fetch time, reqSecDefOptParams result)
+        self._chain_cache = {}
+        
+        # symbol -> (fetch time, price)
+        self._price_cache = {}
+        self.price_ttl = PRICE_CACHE_TTL
+    
+    @classmethod
+    def acquire(cls, host='127.0.0.1', port=7497, client_id=None, timeout=20, readonly=True):
+        """
+        Create an IBConnection and connect it
+        
+        The connection holds the pooled IB client for its settings, so every
+        successful acquire must be balanced by a call to disconnect(), for
+        example by using the connection as a context manager; the connection
+        to IB is only closed once the last holder disconnects.
+        
+        Only callers passing the same explicit client_id share a session;
+        without one, every acquire opens a session of its own.
+        
+        Args:
+            host (str): TWS/IB Gateway host (default: 127.0.0.1)
+            port (int): TWS/IB Gateway port (default: 7497 for paper trading, 7496 for live)
+            client_id (int, optional): Client ID for TWS/IB Gateway. If omitted, a new
+                ID is allocated so the caller gets its own session with TWS
+            timeout (int): Connection timeout in seconds
+            readonly (bool): Whether to connect in readonly mode
+            
+        Returns:
+            IBConnection: The connected connection or None if it could not connect
+        """
+        if client_id is None:
+            client_id = next(cls._client_ids)
+        
+        # A failed connect already gives the client back to the pool
+        connection = cls(host, port, client_id, timeout, readonly)
+        return connection if connection.connect() else None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, tb):
+        self.disconnect()
+        return False
     
     def _ensure_event_loop(self):
         """
@@ -94,6 +294,140 @@ class IBConnection:
             asyncio.set_event_loop(loop)
         return True
     
+    def _qualify(self, contract):
+        """
+        Qualify a contract, reusing earlier results for identical contracts
+        
+        Args:
+            contract (Contract): Contract to qualify
+            
+        Returns:
+            Contract: The qualified contract or None if it could not be qualified
+        """
+        return self._qualify_many([contract])[0]
+    
+    def _get_stock_contract(self, symbol, exchange='SMART'):
+        """
+        Get the qualified USD stock contract for a symbol
+        
+        Args:
+            symbol (str): Stock symbol
+            exchange (str): Exchange to route through
+            
+        Returns:
+            Contract: The qualified stock contract or None if it could not be qualified
+        """
+        return self._qualify(Stock(symbol, exchange, 'USD'))
+    
+    def _qualify_many(self, contracts):
+        """
+        Qualify several contracts with a single request to IB
+        
+        Contracts already in the cache are not sent again; the rest are
+        qualified together in one round-trip instead of one call each.
+        
+        Args:
+            contracts (list): Contracts to qualify
+            
+        Returns:
+            list: Qualified contracts in the same order as the input, with None
+                  for contracts that could not be qualified
+        """
+        keys = [_contract_key(contract) for contract in contracts]
+        results = [self._contract_cache.get(key) for key in keys]
+        
+        misses = [i for i, qualified in enumerate(results) if qualified is None]
+        if misses:
+            # qualifyContracts fills in the contracts in place and only returns
+            # the ones that succeeded, so check conId to match them back up
+            self.ib.qualifyContracts(*[contracts[i] for i in misses])
+            for i in misses:
+                if contracts[i].conId:
+                    results[i] = contracts[i]
+                    self._contract_cache[keys[i]] = contracts[i]
+        
+        for key, qualified in zip(keys, results):
+            if qualified is not None:
+                self._contract_cache.move_to_end(key)
+        while len(self._contract_cache) > CONTRACT_CACHE_SIZE:
+            self._contract_cache.popitem(last=False)
+        return results
+    
+    def _wait_for_tickers(self, tickers, is_ready, timeout=5, on_ready=None):
+        """
+        Wait until every ticker is ready or the timeout expires
+        
+        Returns as soon as the data has arrived instead of sleeping for a fixed
+        amount of time; the timeout is only an upper bound. Tickers that are
+        already complete are not checked again after each update.
+        
+        Args:
+            tickers (list): Tickers returned by reqMktData
+            is_ready (callable): Predicate telling whether a ticker has the data we need
+            timeout (float): Maximum time to wait in seconds
+            on_ready (callable, optional): Called with the index of each ticker as
+                soon as it is ready, so it can be processed while the rest arrive
+            
+        Returns:
+            bool: True if all tickers are ready, False if the timeout expired
+        """
+        deadline = time.monotonic() + timeout
+        pending = range(len(tickers))
+        while True:
+            still_pending = []
+            for i in pending:
+                if not is_ready(tickers[i]):
+                    still_pending.append(i)
+                elif on_ready is not None:
+                    on_ready(i)
+            pending = still_pending
+            if not pending:
+                return True
+            
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            self.ib.waitOnUpdate(timeout=remaining)
+    
+    @contextlib.contextmanager
+    def _mkt_data(self, contract, generic_tick_list='', snapshot=False):
+        """
+        Subscribe to market data for the duration of a with block
+        
+        The subscription is cancelled on exit even when the block raises or
+        returns early, so leaked tickers can't pile up against the IB limit.
+        Snapshot requests end by themselves and are not cancelled.
+        
+        Args:
+            contract: Qualified contract to subscribe to
+            generic_tick_list (str): Comma-separated generic tick types
+            snapshot (bool): Request a one-off snapshot instead of a stream
+            
+        Yields:
+            Ticker: The ticker receiving updates for the contract
+        """
+        ticker = self.ib.reqMktData(contract, generic_tick_list, snapshot, False)
+        try:
+            yield ticker
+        finally:
+            if not snapshot:
+                try:
+                    self.ib.cancelMktData(contract)
+                except Exception as e:
+                    logger.warning(f"Error cancelling market data for {contract.symbol}: {e}")
+    
+    def _release(self):
+        """
+        Return the IB client to the pool
+        
+        Returns:
+            bool: True if this connection was the last one using the client
+        """
+        if not self._pooled:
+            return False
+        self._pooled = False
+        return IBConnectionPool.release(self.host, self.port, self.client_id, self.readonly)
+    
     def connect(self):
         """
         Connect to TWS/IB Gateway
@@ -101,11 +435,15 @@ class IBConnection:
         Returns:
             bool: True if successful, False otherwise
         """
-        # Suppress logs during connection attempt
-        suppress_ib_logs()
-        
         try:
-            if self._connected and self.ib.isConnected():
+            # Hold the pooled client from here until disconnect() or a failed connect
+            if not self._pooled:
+                self.ib = IBConnectionPool.acquire(self.host, self.port, self.client_id, self.readonly)
+                self._pooled = True
+            
+            # The shared client may already be connected by another holder
+            if self.ib.isConnected():
+                self._connected = True
                 return True
             
             # Ensure event loop exists
@@ -120,6 +458,7 @@ class IBConnection:
                 return True
             else:
                 logger.error(f"Failed to connect to IB with client ID {self.client_id}")
+                self._release()
                 return False
         except Exception as e:
             error_msg = str(e)
@@ -136,16 +475,60 @@ class IBConnection:
                 logger.debug(traceback.format_exc())
             
             self._connected = False
+            self._release()
             return False
     
     def disconnect(self):
         """
         Disconnect from Interactive Brokers
+        
+        This gives the pooled IB client back, and only the last connection
+        holding it actually disconnects.
         """
-        if self._connected:
+        # Only the last connection using the shared client closes it
+        if self._release() and self.ib.isConnected():
             self.ib.disconnect()
-            self._connected = False
             logger.info("Disconnected from IB")
+        self._connected = False
+        
+        # Cached lookups belong to the session that produced them
+        self.clear_cache()
+    
+    def clear_cache(self):
+        """
+        Forget all cached qualified contracts and option chain definitions
+        """
+        self._contract_cache.clear()
+        self._chain_cache.clear()
+        self._price_cache.clear()
+    
+    def set_price_ttl(self, seconds):
+        """
+        Set how long a stock price is reused before it is requested again
+        
+        Args:
+            seconds (float): Time to live of cached prices, 0 disables the cache
+        """
+        self.price_ttl = seconds
+    
+    def _cached_price(self, symbol):
+        """
+        Get a recently fetched price for a stock
+        
+        Returns:
+            float: The cached price or None if there is no fresh entry
+        """
+        entry = self._price_cache.get(symbol)
+        if entry is not None and time.monotonic() - entry[0] < self.price_ttl:
+            return entry[1]
+        return None
+    
+    def _store_price(self, symbol, price):
+        """
+        Remember a fetched stock price if it is usable
+        """
+        if price is not None and price > 0:
+            self._price_cache[symbol] = (time.monotonic(), price)
     
     def is_connected(self):
         """
@@ -166,6 +549,10 @@ class IBConnection:
         Returns:
             float: Current stock price or None if error
         """
+        cached_price = self._cached_price(symbol)
+        if cached_price is not None:
+            return cached_price
+        
         if not self.is_connected():
             logger.warning("Not connected to IB. Attempting to connect...")
             if not self.connect():
@@ -185,50 +572,22 @@ class IBConnection:
                 # Use live data when market is open
                 self.set_market_data_type(1)  # 1 = Live
             
-            # Create a stock contract
-            contract = Contract(symbol=symbol, secType='STK', exchange='SMART', currency='USD')
-            
-            # Qualify the contract
-            qualified_contracts = self.ib.qualifyContracts(contract)
-            if not qualified_contracts:
+            # Get the qualified stock contract
+            qualified_contract = self._get_stock_contract(symbol)
+            if qualified_contract is None:
                 logger.error(f"Failed to qualify contract for {symbol}")
                 return None
             
-            qualified_contract = qualified_contracts[0]
-            
             # Request market data
-            ticker = self.ib.reqMktData(contract=qualified_contract)
-            
-            for _ in range(10):
-                self.ib.sleep(0.1)
-                if ticker.marketPrice() is not None and ticker.marketPrice() > 0:
-                    break
-            
-            # Get the last price
-            last_price = ticker.last if ticker.last else (ticker.close if ticker.close else None)
-            bid_price = ticker.bid if ticker.bid else None
-            ask_price = ticker.ask if ticker.ask else None
-            last_rth_trade = ticker.lastRTHTrade.price if hasattr(ticker, 'lastRTHTrade') and ticker.lastRTHTrade else None
-            
-            # If no last price is available, check other prices
-            if last_price is None:
-                if bid_price and ask_price:
-                    # Use midpoint of bid-ask spread
-                    last_price = (bid_price + ask_price) / 2
-                elif bid_price:
-                    last_price = bid_price
-                elif ask_price:
-                    last_price = ask_price
-                elif last_rth_trade:
-                    last_price = last_rth_trade
-            
-            # Cancel the market data subscription
-            self.ib.cancelMktData(qualified_contract)
+            with self._mkt_data(qualified_contract, snapshot=True) as ticker:
+                self._wait_for_tickers([ticker], _has_market_price, timeout=1)
             
+            last_price = _select_price(ticker)
             if last_price is None:
                 logger.error(f"Could not get price for {symbol}")
                 return None
-                
+            
+            self._store_price(symbol, last_price)
             return last_price
             
         except Exception as e:
@@ -272,6 +631,62 @@ class IBConnection:
             logger.error(f"Error setting market data type: {e}")
             return False
             
+    def get_multiple_stock_prices(self, symbols):
+        """
+        Get the current prices of several stocks at once
+        
+        The contracts are qualified in a single request and market data for
+        all of them is requested up front, so the batch shares one wait.
+        Prices fetched within the last price_ttl seconds are reused.
+        
+        Args:
+            symbols (list): Stock symbols
+            
+        Returns:
+            dict: Symbol to current price, with None for symbols without a price
+        """
+        prices = {symbol: self._cached_price(symbol) for symbol in symbols}
+        symbols = [symbol for symbol, price in prices.items() if price is None]
+        if not symbols:
+            return prices
+        
+        if not self.is_connected():
+            logger.warning("Not connected to IB. Attempting to connect...")
+            if not self.connect():
+                return prices
+        
+        try:
+            # Ensure event loop exists for this thread
+            self._ensure_event_loop()
+            
+            # Use frozen data when market is closed, live data when it is open
+            self.set_market_data_type(1 if is_market_hours() else 2)
+            
+            contracts = self._qualify_many([Stock(symbol, 'SMART', 'USD') for symbol in symbols])
+            
+            with contextlib.ExitStack() as subscriptions:
+                subs = [
+                    (symbol, subscriptions.enter_context(self._mkt_data(contract, snapshot=True)))
+                    for symbol, contract in zip(symbols, contracts)
+                    if contract is not None
+                ]
+                self._wait_for_tickers([ticker for _, ticker in subs], _has_market_price, timeout=1)
+            
+            for symbol, ticker in subs:
+                price = prices[symbol] = _select_price(ticker)
+                self._store_price(symbol, price)
+            
+            # One summary for the batch instead of a log line per symbol
+            missing = [symbol for symbol, price in prices.items() if price is None]
+            logger.info("Got prices for %d of %d symbols", len(prices) - len(missing), len(prices))
+            if missing:
+                logger.error(f"Could not get price for {', '.join(missing)}")
+            return prices
+        except Exception as e:
+            logger.error(f"Error getting prices for {', '.join(prices)}: {e}")
+            logger.error(traceback.format_exc())
+            return prices
+    
     def get_option_chain(self, symbol, expiration=None, right='C', target_strike=None, exchange='SMART'):
         """
         Get option chain for a given symbol, expiration, and right
@@ -302,31 +717,27 @@ class IBConnection:
                 self.set_market_data_type(1)  # 1 = Live
             
             # Rest of the method remains the same...
-            stock = Stock(symbol, exchange, 'USD')
-            self.ib.qualifyContracts(stock)
+            stock = self._get_stock_contract(symbol, exchange)
+            if stock is None:
+                logger.error(f"Failed to qualify contract for {symbol}")
+                return None
             
             # Get stock price for reference
-            ticker = self.ib.reqMktData(stock)
-            for _ in range(10):
-                self.ib.sleep(0.1)
-                if ticker.marketPrice() is not None and ticker.marketPrice() > 0:
-                    break
+            with self._mkt_data(stock, snapshot=True) as ticker:
+                self._wait_for_tickers([ticker], _has_market_price, timeout=1)
             
             stock_price = ticker.marketPrice()
             if not stock_price or stock_price <= 0:
-                stock_price = ticker.last if hasattr(ticker, 'last') and ticker.last > 0 else None
+                stock_price = ticker.last if ticker.last > 0 else None
             if not stock_price or stock_price <= 0:
-                stock_price = ticker.close if hasattr(ticker, 'close') and ticker.close > 0 else None
+                stock_price = ticker.close if ticker.close > 0 else None
             
             if not stock_price or stock_price <= 0:
                 logger.warning(f"Could not get valid price for {symbol}")
                 return None
             
-            # Cancel the market data request
-            self.ib.cancelMktData(stock)
-            
             # Get option chains to find expirations and strikes
-            chains = self.ib.reqSecDefOptParams(stock.symbol, '', stock.secType, stock.conId)
+            chains = self.get_option_chains(symbol, exchange)
             
             if not chains:
                 logger.error(f"No option chains found for {symbol}")
@@ -375,12 +786,12 @@ class IBConnection:
                 logger.error(f"No expiration date available for {symbol}")
                 return None
                 
-            # Create option contract for each strike
-            option_contracts = []
-            
-            for strike in strikes:
-                contract = Option(symbol=symbol, lastTradeDateOrContractMonth=expiration, strike=strike, right=right, exchange=exchange, currency='USD',multiplier=100)
-                option_contracts.append(contract)
+            # Create option contract for each strike, in strike order so the
+            # results come out sorted without a separate pass
+            option_contracts = [
+                Option(symbol, expiration, strike, right, exchange, 100, 'USD')
+                for strike in sorted(strikes)
+            ]
             
             if not option_contracts:
                 logger.error(f"No option contracts created for {symbol}")
@@ -394,86 +805,145 @@ class IBConnection:
                 'options': []
             }
             
-            # Rest of the method remains the same...
-            # Qualify and request market data for each option
-            for contract in option_contracts:
-                try:
-                    # Qualify the contract
-                    qualified_contracts = self.ib.qualifyContracts(contract)
-                    if not qualified_contracts:
-                        logger.warning(f"Could not qualify option contract: {contract.symbol} {contract.lastTradeDateOrContractMonth} {contract.strike} {contract.right}")
-                        continue
-                    
-                    qualified_contract = qualified_contracts[0]
+            # Qualify every contract and subscribe to its market data up front,
+            # so that a single wait covers the whole chain. The subscriptions live
+            # on an exit stack and are all cancelled however the block exits.
+            subs = []
+            with contextlib.ExitStack() as subscriptions:
+                qualified_contracts = self._qualify_many(option_contracts)
+                for contract, qualified_contract in zip(option_contracts, qualified_contracts):
+                    try:
+                        if qualified_contract is None:
+                            logger.warning(f"Could not qualify option contract: {contract.symbol} {contract.lastTradeDateOrContractMonth} {contract.strike} {contract.right}")
+                            continue
                     
-                    # Request market data with model computation
-                    ticker = self.ib.reqMktData(qualified_contract, '106', False,False)  # Added genericTickList='13' to get implied volatility
-                   
-                    # Wait for data to arrive - give more time for Greeks and implied volatility
-                    for _ in range(50):  # Increased from 50 to give more time
-                        self.ib.sleep(0.1)
-                        if ticker.modelGreeks is not None and ticker.impliedVolatility is not None and ticker.impliedVolatility > 0:
-                            break
-                    
-                    # Extract market data
-                    bid = ticker.bid if hasattr(ticker, 'bid') and ticker.bid is not None and ticker.bid > 0 else 0
-                    ask = ticker.ask if hasattr(ticker, 'ask') and ticker.ask is not None and ticker.ask > 0 else 0
-                    last = ticker.last if hasattr(ticker, 'last') and ticker.last is not None and ticker.last > 0 else 0
-                    volume = ticker.volume if hasattr(ticker, 'volume') and ticker.volume is not None else 0
-                    open_interest = ticker.openInterest if hasattr(ticker, 'openInterest') and ticker.openInterest is not None else 0
-                    implied_vol = ticker.impliedVolatility if hasattr(ticker, 'impliedVolatility') and ticker.impliedVolatility is not None else 0
-                    # Get real delta from model greeks if available
-                    delta = None
-                    gamma = None
-                    theta = None
-                    vega = None
+                        # Request market data with model computation and open interest
+                        ticker = subscriptions.enter_context(self._mkt_data(qualified_contract, OPTION_GENERIC_TICKS))
+                        subs.append((qualified_contract, ticker))
+                    except Exception as e:
+                        logger.error(f"Error requesting market data for option {contract.symbol} {contract.lastTradeDateOrContractMonth} {contract.strike} {contract.right}: {e}")
+                        logger.error(traceback.format_exc())
+            
+                # Resolved once so the per-option logging costs nothing when disabled
+                log_debug = logger.isEnabledFor(logging.DEBUG)
+                missing_greeks = 0
+                
+                # One slot per subscription keeps the options in strike order
+                # whatever order their data arrives in
+                options = [None] * len(subs)
+                processed = [False] * len(subs)
+                
+                def process(i):
+                    nonlocal missing_greeks
+                    processed[i] = True
+                    contract, ticker = subs[i]
+                    try:
+                        # Extract market data
+                        bid = _positive_or_zero(ticker.bid)
+                        ask = _positive_or_zero(ticker.ask)
+                        last = _positive_or_zero(ticker.last)
+                        volume = _positive_or_zero(ticker.volume)
+                        # IB reports option open interest per right
+                        open_interest = _positive_or_zero(ticker.callOpenInterest if contract.right == 'C' else ticker.putOpenInterest)
+                        implied_vol = ticker.impliedVolatility if ticker.impliedVolatility is not None else 0
+                        # Get real delta from model greeks if available
+                        delta = None
+                        gamma = None
+                        theta = None
+                        vega = None
                     
-                    if hasattr(ticker, 'modelGreeks') and ticker.modelGreeks:
-                        delta = ticker.modelGreeks.delta if hasattr(ticker.modelGreeks, 'delta') else None
-                        gamma = ticker.modelGreeks.gamma if hasattr(ticker.modelGreeks, 'gamma') else None
-                        theta = ticker.modelGreeks.theta if hasattr(ticker.modelGreeks, 'theta') else None
-                        vega = ticker.modelGreeks.vega if hasattr(ticker.modelGreeks, 'vega') else None
+                        greeks = ticker.modelGreeks
+                        if greeks:
+                            delta = greeks.delta
+                            gamma = greeks.gamma
+                            theta = greeks.theta
+                            vega = greeks.vega
                         
-                        logger.debug(f"Got real greeks for {contract.symbol} {contract.right} {contract.strike}: delta={delta}, gamma={gamma}, theta={theta}, vega={vega}")
-                    else:
-                        logger.debug(f"No model greeks available for {contract.symbol} {contract.right} {contract.strike}")
+                            if log_debug:
+                                logger.debug("Got real greeks for %s %s %s: delta=%s, gamma=%s, theta=%s, vega=%s",
+                                             contract.symbol, contract.right, contract.strike, delta, gamma, theta, vega)
+                        else:
+                            missing_greeks += 1
+                            if log_debug:
+                                logger.debug("No model greeks available for %s %s %s", contract.symbol, contract.right, contract.strike)
                         
-                    # Create option data dictionary
-                    option_data = {
-                        'strike': contract.strike,
-                        'expiration': contract.lastTradeDateOrContractMonth,
-                        'option_type': 'CALL' if contract.right == 'C' else 'PUT',
-                        'bid': bid,
-                        'ask': ask,
-                        'last': last,
-                        'volume': volume,
-                        'open_interest': open_interest,
-                        'implied_volatility': implied_vol,
-                        'delta': round(delta, 3) if delta is not None else None,
-                        'gamma': round(gamma, 5) if gamma is not None else None,
-                        'theta': round(theta, 5) if theta is not None else None,
-                        'vega': round(vega, 5) if vega is not None else None
-                    }
+                        # Create option data dictionary
+                        option_data = {
+                            'strike': contract.strike,
+                            'expiration': contract.lastTradeDateOrContractMonth,
+                            'option_type': 'CALL' if contract.right == 'C' else 'PUT',
+                            'bid': bid,
+                            'ask': ask,
+                            'last': last,
+                            'volume': volume,
+                            'open_interest': open_interest,
+                            'implied_volatility': implied_vol,
+                            'delta': round(delta, 3) if delta is not None else None,
+                            'gamma': round(gamma, 5) if gamma is not None else None,
+                            'theta': round(theta, 5) if theta is not None else None,
+                            'vega': round(vega, 5) if vega is not None else None
+                        }
                     
-                    # Add to the result
-                    result['options'].append(option_data)
+                        # Add to the result
+                        options[i] = option_data
                     
-                    # Cancel market data request
-                    self.ib.cancelMktData(qualified_contract)
-        
-                except Exception as e:
-                    logger.error(f"Error getting market data for option {contract.symbol} {contract.lastTradeDateOrContractMonth} {contract.strike} {contract.right}: {e}")
-                    logger.error(traceback.format_exc())
+                    except Exception as e:
+                        logger.error(f"Error getting market data for option {contract.symbol} {contract.lastTradeDateOrContractMonth} {contract.strike} {contract.right}: {e}")
+                        logger.error(traceback.format_exc())
+                
+                # Wait for data to arrive - give more time for Greeks and implied volatility.
+                # Each option is processed as soon as its own data is complete.
+                self._wait_for_tickers([ticker for _, ticker in subs], _has_model_greeks, timeout=5, on_ready=process)
+                
+                # Take whatever arrived for options that did not complete in time
+                for i, done in enumerate(processed):
+                    if not done:
+                        process(i)
             
-            # Sort options by strike price
-            result['options'] = sorted(result['options'], key=lambda x: x['strike'])
+            result['options'] = [option for option in options if option is not None]
             
+            logger.info("Processed %d %s options for %s %s, %d without greeks",
+                        len(result['options']), right, symbol, expiration, missing_greeks)
             return result
         except Exception as e:
             logger.error(f"Error retrieving option chain for {symbol}: {e}")
             logger.error(traceback.format_exc())
             return None
     
+    def get_option_chains(self, symbol, exchange='SMART'):
+        """
+        Get the option chain definitions (expirations and strikes) for a stock
+        
+        Results are cached for OPTION_CHAIN_CACHE_TTL seconds, since they only
+        change on corporate-action days and the request is expensive.
+        
+        Args:
+            symbol (str): Stock symbol
+            exchange (str): Exchange of the underlying stock
+            
+        Returns:
+            list: OptionChain objects from reqSecDefOptParams, or None on error
+        """
+        key = (symbol, exchange)
+        cached = self._chain_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < OPTION_CHAIN_CACHE_TTL:
+            return cached[1]
+        
+        try:
+            stock = self._get_stock_contract(symbol, exchange)
+            if stock is None:
+                logger.error(f"Failed to qualify contract for {symbol}")
+                return None
+            
+            chains = self.ib.reqSecDefOptParams(stock.symbol, '', stock.secType, stock.conId)
+            if chains:
+                self._chain_cache[key] = (time.monotonic(), chains)
+            return chains
+        except Exception as e:
+            logger.error(f"Error retrieving option chain definitions for {symbol}: {e}")
+            logger.error(traceback.format_exc())
+            return None
+    
     def _convert_to_usd(self, value, currency):
         """
         Convert a value to USD if needed
@@ -575,10 +1045,7 @@ class IBConnection:
             stock_count = 0
             option_count = 0
             other_count = 0
-            
-            # Import Option class for isinstance check
-            from ib_async import Option
-            
+
             for position in portfolio:
                 try:
                     symbol = position.contract.symbol
@@ -815,7 +1282,7 @@ class IBConnection:
             
             # Get all open orders
             open_orders = self.ib.openOrders()
-            print(f"open_orders: {open_orders}")
+            logger.debug("Checking %d open orders for order ID %s", len(open_orders), order_id)
             
             # Check if order is in open orders
             for o in open_orders: